@@ -1,13 +1,244 @@
+import argparse
+import hashlib
+import importlib.util
+import inspect
+import json
 import subprocess
+import tempfile
 import yaml
 import sys
 import os
 from pathlib import Path
 
-def run_pipeline(yaml_file):
-    with open(yaml_file) as f:
-        config = yaml.safe_load(f)
+# Components that run inside this interpreter instead of a child process.
+# Keys are the script paths used in pipeline YAML files.
+COMPONENT_REGISTRY = {
+    'src/1_stage_pre_process/data_loader.py': 'data_loader',
+    'src/2_stage_process/feature_engineering.py': 'feature_engineering',
+    'src/2_stage_process/data_analyzer.py': 'data_analyzer',
+    'src/3_stage_post_process/simple_reporter.py': 'simple_reporter',
+    'src/3_stage_post_process/data_exporter.py': 'data_exporter',
+}
+
+_loaded_components = {}
+
+# Compiled pipeline plans, keyed by (path, content sha1)
+PLAN_CACHE_SIZE = 32
+_plan_cache = {}
+
+# Parsed pipeline configs are cached as JSON, keyed by the YAML content hash.
+# Only the most recently used entries are kept, so edited files don't pile up.
+PIPELINE_CACHE_DIR = Path.home() / '.cache' / 'pipeline'
+PIPELINE_CACHE_LIMIT = 64
+
+YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+def _load_pipeline(yaml_file, content=None):
+    """Parse a pipeline YAML file, reusing a cached JSON copy when unchanged.
+
+    Pass content to parse bytes already read from yaml_file.
+    """
+    if content is None:
+        content = Path(yaml_file).read_bytes()
+    cache_path = PIPELINE_CACHE_DIR / f"{hashlib.sha1(content).hexdigest()}.json"
+
+    try:
+        with open(cache_path) as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        pass
+    else:
+        # Mark the entry as recently used for eviction
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+        return config
+
+    config = yaml.load(content, Loader=YamlLoader)
+
+    # Only cache configs that survive a JSON round trip unchanged; non-string
+    # keys or values like dates would come back different on a cache hit
+    try:
+        serialized = json.dumps(config)
+        if json.loads(serialized) != config:
+            return config
+    except (TypeError, ValueError):
+        return config
+
+    # Write atomically so a concurrent run never reads a partial cache file
+    tmp_path = None
+    try:
+        PIPELINE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', dir=PIPELINE_CACHE_DIR, suffix='.tmp', delete=False) as f:
+            tmp_path = f.name
+            f.write(serialized)
+        os.replace(tmp_path, cache_path)
+        _evict_pipeline_cache()
+    except OSError:
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+    return config
+
+def _evict_pipeline_cache():
+    """Delete the least recently used cache entries beyond PIPELINE_CACHE_LIMIT."""
+    entries = sorted(PIPELINE_CACHE_DIR.glob('*.json'), key=lambda path: path.stat().st_mtime, reverse=True)
+    for stale in entries[PIPELINE_CACHE_LIMIT:]:
+        stale.unlink(missing_ok=True)
+
+def load_component(script):
+    """Import a registered component module, or return None if unregistered."""
+    key = Path(script).as_posix()
+    if key not in COMPONENT_REGISTRY:
+        return None
 
+    if key not in _loaded_components:
+        # Stage directories start with a digit, so import by file location
+        module_path = Path(__file__).resolve().parent / key
+        spec = importlib.util.spec_from_file_location(COMPONENT_REGISTRY[key], module_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _loaded_components[key] = module
+
+    return _loaded_components[key]
+
+def build_namespace(parser, params):
+    """Parse a step's params with the component's own parser, without a subprocess.
+
+    Going through parse_args keeps argparse's type conversion, nargs handling
+    and choices validation identical to running the script directly.
+    """
+    def error(message):
+        # Keep argparse's usage text so it can be shown when the step runs,
+        # instead of printing it to stderr while the plan is being built
+        raise ValueError(f"{parser.prog}: error: {message}\n{parser.format_usage().rstrip()}")
+
+    parser.error = error
+    return parser.parse_args(build_step_args(params))
+
+def forget_outputs(frames, output_path=None, output_dir=None):
+    """Drop cached frames for files a step is about to (re)write."""
+    if output_path:
+        frames.pop(Path(output_path).resolve(), None)
+
+    if output_dir:
+        directory = Path(output_dir).resolve()
+        for path in [path for path in frames if directory in path.parents]:
+            del frames[path]
+
+def run_component(component, namespace, frames):
+    """Run a component in-process, sharing DataFrames produced by earlier steps.
+
+    frames maps resolved output paths to the DataFrame a step returned. A
+    component whose main() accepts df receives the frame for its input path
+    instead of re-reading the file. Only Parquet outputs are shared, since
+    reading them back yields the same dtypes as the in-memory frame.
+    """
+    kwargs = {}
+    input_path = getattr(namespace, 'input_path', None)
+    if input_path and 'df' in inspect.signature(component.main).parameters:
+        frame = frames.get(Path(input_path).resolve())
+        if frame is not None:
+            kwargs['df'] = frame
+
+    result = component.main(namespace, **kwargs)
+
+    output_path = getattr(namespace, 'output_path', None)
+    if output_path and result is not None and Path(output_path).suffix.lower() == '.parquet':
+        frames[Path(output_path).resolve()] = result
+
+def build_step_args(params):
+    """Convert a step's params dict into command-line arguments."""
+    args = []
+    for key, value in params.items():
+        # Handle different parameter formats
+        if key.startswith('--'):
+            flag = key  # Already has --
+        else:
+            flag = f"--{key.replace('_', '-')}"
+
+        if isinstance(value, bool):
+            if value:
+                args.append(flag)
+        elif isinstance(value, list):
+            args.append(flag)
+            for item in value:
+                args.append(str(item))
+        else:
+            args.append(flag)
+            args.append(str(value))
+
+    return args
+
+def _step_outputs(params):
+    """Return the (output_path, output_dir) a step's params write to, if any."""
+    values = {key.lstrip('-').replace('-', '_'): value for key, value in params.items()}
+    return values.get('output_path'), values.get('output_dir')
+
+def _plan_step(step, step_number):
+    """Resolve a step config into its script, arguments and prepared Namespace.
+
+    Returns None for an invalid step. Errors loading a component or building
+    its Namespace are kept in 'error' and reported when the step runs.
+    """
+    name = step.get('name', step.get('id', f'Step {step_number}'))
+
+    # Handle both old and new formats
+    if 'script' in step:
+        script = Path(step['script'])
+        params = step.get('params', {})
+    elif 'component' in step:
+        script = Path(step['component'])
+        params = step.get('parameters', {})
+    else:
+        return None
+
+    planned = {
+        'name': name,
+        'script': script,
+        'args': build_step_args(params),
+        'outputs': _step_outputs(params),
+        'component': None,
+        'namespace': None,
+        'error': None
+    }
+
+    try:
+        planned['component'] = load_component(script)
+        if planned['component'] is not None:
+            parser = planned['component'].build_parser()
+            parser.prog = str(script)
+            planned['namespace'] = build_namespace(parser, params)
+    except Exception as e:
+        planned['error'] = e
+
+    return planned
+
+def _load_pipeline_plan(yaml_file):
+    """Build the command plan for a pipeline, cached by path and content hash.
+
+    The file is read once, so the plan always matches the hash it is cached
+    under. Plans with a step that failed to load or parse are not cached, so
+    the step is retried on the next run.
+    """
+    content = Path(yaml_file).read_bytes()
+    cache_key = (str(yaml_file), hashlib.sha1(content).hexdigest())
+    if cache_key in _plan_cache:
+        return _plan_cache[cache_key]
+
+    plan = _build_pipeline_plan(_load_pipeline(yaml_file, content))
+
+    if plan is not None and all(step is None or step['error'] is None for step in plan['steps']):
+        if len(_plan_cache) >= PLAN_CACHE_SIZE:
+            # Evict the oldest plan
+            del _plan_cache[next(iter(_plan_cache))]
+        _plan_cache[cache_key] = plan
+
+    return plan
+
+def _build_pipeline_plan(config):
+    """Resolve a parsed pipeline config into its header and planned steps."""
     # Handle both old and new YAML formats
     if 'pipeline' in config:
         # Old format
@@ -16,55 +247,52 @@ def run_pipeline(yaml_file):
         # New format
         steps = config['steps']
     else:
+        return None
+
+    planned_steps = []
+    for step_number, step in enumerate(steps, start=1):
+        planned = _plan_step(step, step_number)
+        planned_steps.append(planned)
+        if planned is None:
+            break
+
+    return {
+        'name': config.get('name', 'Unnamed Pipeline'),
+        'description': config.get('description', 'No description'),
+        'total_steps': len(steps),
+        'steps': tuple(planned_steps)
+    }
+
+def run_pipeline(yaml_file):
+    plan = _load_pipeline_plan(yaml_file)
+
+    if plan is None:
         print("❌ Invalid pipeline configuration. Expected 'pipeline' or 'steps' key.")
         return
 
-    total_steps = len(steps)
+    total_steps = plan['total_steps']
     step_number = 0
+    returncode = 0
+    frames = {}
 
     # Print pipeline header
-    pipeline_name = config.get('name', 'Unnamed Pipeline')
-    pipeline_description = config.get('description', 'No description')
-    print(f"\n🔧 Pipeline: {pipeline_name}")
-    print(f"📝 Description: {pipeline_description}")
+    print(f"\n🔧 Pipeline: {plan['name']}")
+    print(f"📝 Description: {plan['description']}")
     print(f"📊 Total steps: {total_steps}")
 
-    for step in steps:
+    for step in plan['steps']:
         step_number += 1
-        name = step.get('name', step.get('id', f'Step {step_number}'))
-
-        # Handle both old and new formats
-        if 'script' in step:
-            script = Path(step['script'])
-            params = step.get('params', {})
-        elif 'component' in step:
-            script = Path(step['component'])
-            params = step.get('parameters', {})
-        else:
+
+        if step is None:
             print(f"❌ Invalid step configuration for step {step_number}")
+            returncode = 1
             break
 
-        args = []
-        for key, value in params.items():
-            # Handle different parameter formats
-            if key.startswith('--'):
-                flag = key  # Already has --
-            else:
-                flag = f"--{key.replace('_', '-')}"
-
-            if isinstance(value, bool):
-                if value:
-                    args.append(flag)
-            elif isinstance(value, list):
-                args.append(flag)
-                for item in value:
-                    args.append(str(item))
-            else:
-                args.append(flag)
-                args.append(str(value))
+        name = step['name']
+        script = step['script']
 
         # Create full command for display
-        cmd_str = f"python {script} {' '.join(args)}"
+        cmd_str = f"python {script} {' '.join(step['args'])}"
 
         # Print step information
         print(f"\n{'='*80}")
@@ -75,17 +303,33 @@ def run_pipeline(yaml_file):
         print(f"Full command:\n{cmd_str}")
         print(f"{'-'*80}")
 
-        # Run the command
-        result = subprocess.run(['python', str(script)] + args, capture_output=False)
+        # Whatever this step writes replaces any frame cached for those files
+        forget_outputs(frames, *step['outputs'])
+
+        if step['error'] is not None:
+            print(f"Error: {step['error']}")
+            returncode = 1
+        elif step['component'] is not None:
+            # Run the component in this process on a copy of the cached Namespace
+            try:
+                run_component(step['component'], argparse.Namespace(**vars(step['namespace'])), frames)
+                returncode = 0
+            except Exception as e:
+                print(f"Error: {e}")
+                returncode = 1
+        else:
+            # Run the command
+            result = subprocess.run(['python', str(script)] + step['args'], capture_output=False)
+            returncode = result.returncode
 
-        if result.returncode != 0:
+        if returncode != 0:
             print(f"\n❌ Step {step_number}/{total_steps} failed: {name}")
-            print(f"Return code: {result.returncode}")
+            print(f"Return code: {returncode}")
             break
         else:
             print(f"\n✅ Step {step_number}/{total_steps} completed successfully: {name}")
 
-    if step_number == total_steps and result.returncode == 0:
+    if step_number == total_steps and returncode == 0:
         print(f"\n🎉 Pipeline completed successfully! All {total_steps} steps executed.")
     else:
         print(f"\n⚠️ Pipeline stopped at step {step_number}/{total_steps}.")
@@ -15,6 +15,13 @@ import numpy as np
 import json
 from pathlib import Path
 import logging
+import sys
+
+# Shared helpers live in src/, one level above the stage directories
+_src_dir = str(Path(__file__).resolve().parent.parent)
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+from pipeline_io import save_data
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -35,6 +42,9 @@ def load_data(input_path, file_format='csv'):
     elif file_format.lower() == 'excel':
         logger.info(f"Loading Excel file: {input_path}")
         return pd.read_excel(input_path)
+    elif file_format.lower() == 'parquet':
+        logger.info(f"Loading Parquet file: {input_path}")
+        return pd.read_parquet(input_path, engine='pyarrow')
     else:
         raise ValueError(f"Unsupported file format: {file_format}")
 
@@ -56,16 +66,18 @@ def clean_data(df, remove_duplicates=True):
 
     return df
 
-def generate_sample_data(output_path):
+def generate_sample_data(output_path, fast_csv=False):
     """Generate sample data for demonstration purposes."""
     logger.info("Generating sample dataset")
 
     np.random.seed(42)
     n_samples = 100
 
+    ids = np.arange(1, n_samples + 1, dtype=np.int64)
+
     data = {
-        'id': range(1, n_samples + 1),
-        'name': [f'Item_{i}' for i in range(1, n_samples + 1)],
+        'id': ids,
+        'name': np.char.add('Item_', ids.astype('U20')),
         'category': np.random.choice(['A', 'B', 'C'], n_samples),
         'value': np.random.uniform(10, 100, n_samples),
         'quantity': np.random.randint(1, 10, n_samples),
@@ -75,28 +87,33 @@ def generate_sample_data(output_path):
     df = pd.DataFrame(data)
 
     # Save data
-    output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(output_path, index=False)
+    output_path = save_data(df, output_path, fast_csv)
 
     logger.info(f"Generated sample data with {len(df)} rows: {output_path}")
     return df
 
-def main():
+def build_parser():
+    """Build the command-line parser for this component."""
     parser = argparse.ArgumentParser(description='Simple Data Loading Component')
     parser.add_argument('--input-path', type=str, help='Path to input data')
     parser.add_argument('--output-path', type=str, required=True, help='Path to save processed data')
-    parser.add_argument('--file-format', type=str, default='csv', choices=['csv', 'json', 'excel'], 
-                       help='Input/output file format')
+    parser.add_argument('--file-format', type=str, default='csv', choices=['csv', 'json', 'excel', 'parquet'], 
+                       help='Input file format')
     parser.add_argument('--clean-data', action='store_true', help='Enable data cleaning')
     parser.add_argument('--generate-sample', action='store_true', 
                        help='Generate sample data instead of loading from input')
+    parser.add_argument('--fast-csv', action='store_true',
+                       help='Write CSV output with the pyarrow writer')
+
+    return parser
 
-    args = parser.parse_args()
+def main(args=None):
+    if args is None:
+        args = build_parser().parse_args()
 
     try:
         if args.generate_sample:
-            df = generate_sample_data(args.output_path)
+            df = generate_sample_data(args.output_path, args.fast_csv)
         else:
             if not args.input_path:
                 raise ValueError("--input-path is required when not generating sample data")
@@ -109,9 +126,7 @@ def main():
                 df = clean_data(df)
 
             # Save processed data
-            output_path = Path(args.output_path)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            df.to_csv(output_path, index=False)
+            output_path = save_data(df, args.output_path, args.fast_csv)
             logger.info(f"Saved processed data to: {output_path}")
 
         # Print summary
@@ -120,6 +135,7 @@ def main():
         logger.info(f"  - Columns: {list(df.columns)}")
 
         print("✅ Data loading completed successfully!")
+        return df
 
     except Exception as e:
         logger.error(f"Error in data loading: {str(e)}")
@@ -16,28 +16,47 @@ import numpy as np
 import json
 from pathlib import Path
 import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared helpers live in src/, one level above the stage directories
+_src_dir = str(Path(__file__).resolve().parent.parent)
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+from pipeline_io import read_data, estimate_memory_mb
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def analyze_data_quality(df):
-    """Analyze data quality and completeness."""
+def analyze_data_quality(df, check_duplicates=True):
+    """Analyze data quality and completeness.
+
+    Set check_duplicates=False when the data was already deduplicated upstream;
+    duplicate_rows is then reported as None.
+    """
     logger.info("Analyzing data quality")
 
     quality_report = {
         'total_rows': len(df),
         'total_columns': len(df.columns),
-        'missing_values': df.isnull().sum().to_dict(),
-        'duplicate_rows': df.duplicated().sum(),
-        'data_types': df.dtypes.astype(str).to_dict()
+        'missing_values': {col: int(np.count_nonzero(pd.isna(df[col].values))) for col in df.columns},
+        'duplicate_rows': int(df.duplicated().sum()) if check_duplicates else None,
+        'data_types': {col: str(dtype) for col, dtype in df.dtypes.items()}
     }
 
     logger.info(f"Data quality analysis complete: {len(df)} rows, {len(df.columns)} columns")
     return quality_report
 
-def generate_statistics(df):
-    """Generate descriptive statistics."""
+def compute_correlations(df):
+    """Compute the numeric correlation matrix, or None with fewer than two numeric columns."""
+    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    if len(numeric_cols) > 1:
+        return df[numeric_cols].corr()
+    return None
+
+def generate_statistics(df, corr=None):
+    """Generate descriptive statistics, reusing a precomputed correlation matrix if given."""
     logger.info("Generating descriptive statistics")
 
     numeric_cols = df.select_dtypes(include=[np.number]).columns
@@ -49,44 +68,60 @@ def generate_statistics(df):
         'correlations': {}
     }
 
-    # Categorical analysis
+    # Categorical analysis, deriving all fields from a single value_counts pass
     for col in categorical_cols:
+        value_counts = df[col].value_counts()
+        if len(value_counts) > 0:
+            # Match mode(): on ties the smallest value wins, unless mixed types can't be ordered
+            tied = value_counts.index[value_counts.to_numpy() == value_counts.iloc[0]]
+            try:
+                most_common = tied.min()
+            except TypeError:
+                most_common = tied[0]
+        else:
+            most_common = None
+
         stats['categorical_summary'][col] = {
-            'unique_values': df[col].nunique(),
-            'most_common': df[col].mode().iloc[0] if len(df[col].mode()) > 0 else None,
-            'value_counts': df[col].value_counts().head().to_dict()
+            'unique_values': len(value_counts),
+            'most_common': most_common,
+            'value_counts': value_counts.head().to_dict()
         }
 
     # Correlation analysis for numeric columns
     if len(numeric_cols) > 1:
-        correlations = df[numeric_cols].corr()
-        stats['correlations'] = correlations.to_dict()
+        if corr is None:
+            corr = df[numeric_cols].corr()
+        stats['correlations'] = corr.to_dict()
 
     logger.info(f"Statistics generated for {len(numeric_cols)} numeric and {len(categorical_cols)} categorical columns")
     return stats
 
-def find_insights(df):
-    """Find interesting patterns and insights in the data."""
+def find_insights(df, corr=None):
+    """Find interesting patterns and insights, reusing a precomputed correlation matrix if given."""
     logger.info("Finding data insights")
 
     insights = []
 
     numeric_cols = df.select_dtypes(include=[np.number]).columns
 
-    # Find outliers using IQR method
-    for col in numeric_cols:
-        Q1 = df[col].quantile(0.25)
-        Q3 = df[col].quantile(0.75)
-        IQR = Q3 - Q1
-        outliers = df[(df[col] < Q1 - 1.5 * IQR) | (df[col] > Q3 + 1.5 * IQR)]
-
-        if len(outliers) > 0:
-            insights.append({
-                'type': 'outliers',
-                'column': col,
-                'count': len(outliers),
-                'percentage': (len(outliers) / len(df)) * 100
-            })
+    # Find outliers using IQR method, counting all numeric columns in one pass
+    if len(numeric_cols) > 0:
+        quartiles = df[numeric_cols].quantile([0.25, 0.75]).to_numpy()
+        IQR = quartiles[1] - quartiles[0]
+        lower = quartiles[0] - 1.5 * IQR
+        upper = quartiles[1] + 1.5 * IQR
+
+        values = df[numeric_cols].to_numpy(dtype=float, na_value=np.nan)
+        outlier_counts = ((values < lower) | (values > upper)).sum(axis=0)
+
+        for col, count in zip(numeric_cols, outlier_counts):
+            if count > 0:
+                insights.append({
+                    'type': 'outliers',
+                    'column': col,
+                    'count': int(count),
+                    'percentage': (count / len(df)) * 100
+                })
 
     # Find columns with high missing values
     missing_pct = (df.isnull().sum() / len(df)) * 100
@@ -101,33 +136,35 @@ def find_insights(df):
 
     # Find highly correlated pairs
     if len(numeric_cols) > 1:
-        corr_matrix = df[numeric_cols].corr()
-
-        # Find pairs with correlation > 0.8 or < -0.8
-        for i in range(len(corr_matrix.columns)):
-            for j in range(i+1, len(corr_matrix.columns)):
-                corr_val = corr_matrix.iloc[i, j]
-                if abs(corr_val) > 0.8:
-                    insights.append({
-                        'type': 'high_correlation',
-                        'column_1': corr_matrix.columns[i],
-                        'column_2': corr_matrix.columns[j],
-                        'correlation': corr_val
-                    })
+        corr_matrix = corr if corr is not None else df[numeric_cols].corr()
+        corr_values = corr_matrix.to_numpy()
+
+        # Find pairs above the diagonal with correlation > 0.8 or < -0.8
+        high_pairs = np.argwhere(np.triu(np.abs(corr_values), k=1) > 0.8)
+        for i, j in high_pairs:
+            insights.append({
+                'type': 'high_correlation',
+                'column_1': corr_matrix.columns[i],
+                'column_2': corr_matrix.columns[j],
+                'correlation': corr_values[i, j]
+            })
 
     logger.info(f"Found {len(insights)} insights")
     return insights
 
-def create_summary_report(df, quality_report, stats, insights):
+def create_summary_report(df, quality_report, stats, insights, memory_usage_mb=None):
     """Create a comprehensive summary report."""
     logger.info("Creating summary report")
 
+    if memory_usage_mb is None:
+        memory_usage_mb = estimate_memory_mb(df)
+
     report = {
         'dataset_overview': {
             'name': 'Analysis Report',
             'timestamp': pd.Timestamp.now().isoformat(),
             'shape': df.shape,
-            'memory_usage_mb': round(df.memory_usage(deep=True).sum() / 1024**2, 2)
+            'memory_usage_mb': memory_usage_mb
         },
         'data_quality': quality_report,
         'statistics': stats,
@@ -136,7 +173,7 @@ def create_summary_report(df, quality_report, stats, insights):
     }
 
     # Add recommendations based on findings
-    if quality_report['duplicate_rows'] > 0:
+    if quality_report['duplicate_rows']:
         report['recommendations'].append("Consider removing duplicate rows")
 
     for insight in insights:
@@ -148,28 +185,44 @@ def create_summary_report(df, quality_report, stats, insights):
     logger.info("Summary report created successfully")
     return report
 
-def main():
+def build_parser():
+    """Build the command-line parser for this component."""
     parser = argparse.ArgumentParser(description='Simple Data Analysis Component')
     parser.add_argument('--input-path', type=str, required=True, help='Path to input data file')
     parser.add_argument('--output-path', type=str, required=True, help='Path to save analysis report')
     parser.add_argument('--save-format', type=str, choices=['json', 'csv'], default='json', 
                        help='Format to save the analysis report')
+    parser.add_argument('--fast-csv', action='store_true',
+                       help='Read CSV input with the pyarrow parser')
+    parser.add_argument('--skip-duplicate-check', action='store_true',
+                       help='Skip counting duplicate rows (e.g. input already deduplicated)')
 
-    args = parser.parse_args()
+    return parser
+
+def main(args=None):
+    if args is None:
+        args = build_parser().parse_args()
 
     try:
         # Load data
         logger.info(f"Loading data from {args.input_path}")
-        df = pd.read_csv(args.input_path)
+        df = read_data(args.input_path, args.fast_csv)
         logger.info(f"Loaded data with shape: {df.shape}")
 
-        # Perform analysis
-        quality_report = analyze_data_quality(df)
-        statistics = generate_statistics(df)
-        insights = find_insights(df)
+        # Perform analysis; the three passes only read df, so run them concurrently
+        corr = compute_correlations(df)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            quality_future = executor.submit(analyze_data_quality, df, not args.skip_duplicate_check)
+            statistics_future = executor.submit(generate_statistics, df, corr)
+            insights_future = executor.submit(find_insights, df, corr)
+
+        quality_report = quality_future.result()
+        statistics = statistics_future.result()
+        insights = insights_future.result()
 
         # Create comprehensive report
-        report = create_summary_report(df, quality_report, statistics, insights)
+        memory_usage_mb = estimate_memory_mb(df)
+        report = create_summary_report(df, quality_report, statistics, insights, memory_usage_mb)
 
         # Save analysis report
         output_path = Path(args.output_path)
@@ -15,8 +15,15 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 import logging
+import sys
 import json
 
+# Shared helpers live in src/, one level above the stage directories
+_src_dir = str(Path(__file__).resolve().parent.parent)
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+from pipeline_io import read_data, save_data
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -55,8 +62,8 @@ def create_aggregations(df, group_by_col='category'):
     # Flatten column names
     agg_stats.columns = ['_'.join(col).strip() for col in agg_stats.columns]
 
-    # Merge back to original data
-    df = df.merge(agg_stats, left_on=group_by_col, right_index=True, how='left')
+    # Broadcast back to original rows with an index lookup rather than a merge
+    df = df.join(agg_stats, on=group_by_col, lsuffix='_x', rsuffix='_y')
 
     logger.info(f"Added {len(agg_stats.columns)} aggregation fields")
     return df
@@ -67,8 +74,7 @@ def format_data(df):
 
     # Round numeric columns to 2 decimal places
     numeric_cols = df.select_dtypes(include=[np.number]).columns
-    for col in numeric_cols:
-        df[col] = df[col].round(2)
+    df[numeric_cols] = df[numeric_cols].round(2)
 
     # Convert category to title case
     if 'category' in df.columns:
@@ -82,22 +88,29 @@ def apply_filters(df, min_value=None, max_value=None, categories=None):
     logger.info("Applying filters")
     initial_rows = len(df)
 
+    # Combine all criteria into one mask so the frame is sliced only once
+    mask = np.ones(initial_rows, dtype=bool)
+
     if min_value is not None and 'value' in df.columns:
-        df = df[df['value'] >= min_value]
+        mask &= df['value'].to_numpy() >= min_value
         logger.info(f"Applied min_value filter: {min_value}")
 
     if max_value is not None and 'value' in df.columns:
-        df = df[df['value'] <= max_value]
+        mask &= df['value'].to_numpy() <= max_value
         logger.info(f"Applied max_value filter: {max_value}")
 
     if categories and 'category' in df.columns:
-        df = df[df['category'].isin(categories)]
+        mask &= df['category'].isin(categories).to_numpy()
         logger.info(f"Applied category filter: {categories}")
 
+    if not mask.all():
+        df = df[mask]
+
     logger.info(f"Filtered from {initial_rows} to {len(df)} rows")
     return df
 
-def main():
+def build_parser():
+    """Build the command-line parser for this component."""
     parser = argparse.ArgumentParser(description='Simple Data Transformation Component')
     parser.add_argument('--input-path', type=str, required=True, help='Path to input data file')
     parser.add_argument('--output-path', type=str, required=True, help='Path to save transformed data')
@@ -108,13 +121,18 @@ def main():
     parser.add_argument('--min-value', type=float, help='Minimum value filter')
     parser.add_argument('--max-value', type=float, help='Maximum value filter')
     parser.add_argument('--categories', nargs='+', help='Categories to include in filter')
+    parser.add_argument('--fast-csv', action='store_true', help='Read CSV input with the pyarrow parser')
 
-    args = parser.parse_args()
+    return parser
+
+def main(args=None):
+    if args is None:
+        args = build_parser().parse_args()
 
     try:
         # Load data
         logger.info(f"Loading data from {args.input_path}")
-        df = pd.read_csv(args.input_path)
+        df = read_data(args.input_path, args.fast_csv)
         logger.info(f"Loaded data with shape: {df.shape}")
 
         # Apply transformations
@@ -132,15 +150,14 @@ def main():
             df = apply_filters(df, args.min_value, args.max_value, args.categories)
 
         # Save transformed data
-        output_path = Path(args.output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        df.to_csv(output_path, index=False)
+        save_data(df, args.output_path)
 
         logger.info("Data Transformation Summary:")
         logger.info(f"  - Final shape: {df.shape}")
         logger.info(f"  - Columns: {list(df.columns)}")
 
         print("✅ Data transformation completed successfully!")
+        return df
 
     except Exception as e:
         logger.error(f"Error in data transformation: {str(e)}")
@@ -14,22 +14,58 @@ import pandas as pd
 import json
 from pathlib import Path
 import logging
+import sys
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared helpers live in src/, one level above the stage directories
+_src_dir = str(Path(__file__).resolve().parent.parent)
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+from pipeline_io import read_data, save_data, fast_to_csv, estimate_memory_mb
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def export_to_csv(df, output_path):
-    """Export data to CSV format."""
+# The Excel fallback writes the same CSV path as the CSV export, so
+# concurrent format exports must not write CSVs at the same time
+_csv_write_lock = threading.Lock()
+
+def export_to_csv(df, output_path, fast_csv=False):
+    """Export data to CSV format, using the pyarrow writer if fast_csv is set."""
     logger.info(f"Exporting to CSV: {output_path}")
-    df.to_csv(output_path, index=False)
+    with _csv_write_lock:
+        if fast_csv:
+            fast_to_csv(df, output_path)
+        else:
+            df.to_csv(output_path, index=False)
     return output_path
 
-def export_to_json(df, output_path):
-    """Export data to JSON format."""
-    logger.info(f"Exporting to JSON: {output_path}")
-    df.to_json(output_path, orient='records', indent=2)
+def _format_datetimes(df):
+    """Render datetime columns as the text a CSV intermediate would have held.
+
+    Columns of midnight timestamps become 'YYYY-MM-DD', others
+    'YYYY-MM-DD HH:MM:SS', so Parquet inputs export the same JSON as CSV ones.
+    """
+    formatted = {}
+    for col in df.select_dtypes(include=['datetime', 'datetimetz']).columns:
+        values = df[col].dropna()
+        date_only = (values == values.dt.normalize()).all()
+        formatted[col] = df[col].dt.strftime('%Y-%m-%d' if date_only else '%Y-%m-%d %H:%M:%S')
+
+    return df.assign(**formatted) if formatted else df
+
+def export_to_json(df, output_path, json_lines=False):
+    """Export data to JSON format, or newline-delimited JSON if json_lines is set."""
+    df = _format_datetimes(df)
+    if json_lines:
+        logger.info(f"Exporting to JSON Lines: {output_path}")
+        df.to_json(output_path, orient='records', lines=True)
+    else:
+        logger.info(f"Exporting to JSON: {output_path}")
+        df.to_json(output_path, orient='records', indent=2)
     return output_path
 
 def export_to_excel(df, output_path):
@@ -43,14 +79,23 @@ def export_to_excel(df, output_path):
         csv_path = output_path.with_suffix('.csv')
         return export_to_csv(df, csv_path)
 
-def create_data_archive(files, archive_path):
-    """Create a compressed archive of exported files."""
+def export_to_parquet(df, output_path):
+    """Export data to Parquet format."""
+    logger.info(f"Exporting to Parquet: {output_path}")
+    return save_data(df, output_path)
+
+def create_data_archive(files, archive_path, compress_level=1):
+    """Create a compressed archive of exported files.
+
+    Deflate level 1 is several times faster than the default level 6 and
+    still compresses CSV/JSON text well.
+    """
     logger.info(f"Creating archive: {archive_path}")
 
     try:
         import zipfile
 
-        with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=compress_level) as zipf:
             for file_path in files:
                 if Path(file_path).exists():
                     zipf.write(file_path, Path(file_path).name)
@@ -63,17 +108,34 @@ def create_data_archive(files, archive_path):
         logger.warning("zipfile not available, skipping archive creation")
         return None
 
-def generate_export_summary(df, exported_files):
+def export_format(format_type, df, output_dir, filename, json_lines=False, fast_csv=False):
+    """Export data in a single format and return the written file path."""
+    if format_type == 'csv':
+        return export_to_csv(df, output_dir / f"{filename}.csv", fast_csv)
+    elif format_type == 'json':
+        suffix = 'jsonl' if json_lines else 'json'
+        return export_to_json(df, output_dir / f"{filename}.{suffix}", json_lines)
+    elif format_type == 'excel':
+        return export_to_excel(df, output_dir / f"{filename}.xlsx")
+    elif format_type == 'parquet':
+        return export_to_parquet(df, output_dir / f"{filename}.parquet")
+    else:
+        raise ValueError(f"Unsupported export format: {format_type}")
+
+def generate_export_summary(df, exported_files, memory_usage_mb=None):
     """Generate a summary of the export process."""
     logger.info("Generating export summary")
 
+    if memory_usage_mb is None:
+        memory_usage_mb = estimate_memory_mb(df)
+
     summary = {
         'export_timestamp': pd.Timestamp.now().isoformat(),
         'dataset_info': {
             'rows': len(df),
             'columns': len(df.columns),
             'column_names': list(df.columns),
-            'memory_usage_mb': round(df.memory_usage(deep=True).sum() / 1024**2, 2)
+            'memory_usage_mb': memory_usage_mb
         },
         'exported_files': []
     }
@@ -90,36 +152,54 @@ def generate_export_summary(df, exported_files):
 
     return summary
 
-def main():
+def build_parser():
+    """Build the command-line parser for this component."""
     parser = argparse.ArgumentParser(description='Simple Data Export Component')
     parser.add_argument('--input-path', type=str, required=True, help='Path to input data file')
     parser.add_argument('--output-dir', type=str, required=True, help='Directory to save exported files')
-    parser.add_argument('--formats', nargs='+', choices=['csv', 'json', 'excel'], 
+    parser.add_argument('--formats', nargs='+', choices=['csv', 'json', 'excel', 'parquet'], 
                        default=['csv'], help='Export formats')
     parser.add_argument('--filename', type=str, default='exported_data', 
                        help='Base filename for exported files')
     parser.add_argument('--create-archive', action='store_true', 
                        help='Create compressed archive of exported files')
+    parser.add_argument('--compress-level', type=int, default=1, choices=range(0, 10),
+                       metavar='{0-9}', help='Deflate level for the archive (1 = fastest)')
     parser.add_argument('--save-summary', action='store_true',
                        help='Save export summary as JSON')
+    parser.add_argument('--json-lines', action='store_true',
+                       help='Write JSON exports as newline-delimited records (.jsonl)')
+    parser.add_argument('--fast-csv', action='store_true',
+                       help='Write CSV exports with the pyarrow writer')
 
-    args = parser.parse_args()
+    return parser
+
+def main(args=None, df=None):
+    """Run the export; pass df to reuse data already loaded from args.input_path."""
+    if args is None:
+        args = build_parser().parse_args()
 
     try:
-        # Load data
-        logger.info(f"Loading data from {args.input_path}")
-
-        # Try to load as CSV first, then JSON
-        try:
-            df = pd.read_csv(args.input_path)
-        except:
-            try:
-                with open(args.input_path, 'r') as f:
-                    data = json.load(f)
-                df = pd.DataFrame(data)
-            except:
-                logger.error("Could not load data. Supported formats: CSV, JSON")
-                raise
+        if df is not None:
+            logger.info(f"Using in-memory data for {args.input_path}")
+        else:
+            # Load data
+            logger.info(f"Loading data from {args.input_path}")
+
+            # Load Parquet by extension, otherwise try CSV first, then JSON
+            if Path(args.input_path).suffix.lower() == '.parquet':
+                df = read_data(args.input_path)
+            else:
+                try:
+                    df = read_data(args.input_path)
+                except:
+                    try:
+                        with open(args.input_path, 'r') as f:
+                            data = json.load(f)
+                        df = pd.DataFrame(data)
+                    except:
+                        logger.error("Could not load data. Supported formats: CSV, JSON, Parquet")
+                        raise
 
         logger.info(f"Loaded data with shape: {df.shape}")
 
@@ -127,21 +207,13 @@ def main():
         output_dir = Path(args.output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Export to specified formats
-        exported_files = []
-
-        for format_type in args.formats:
-            if format_type == 'csv':
-                output_path = output_dir / f"{args.filename}.csv"
-                exported_files.append(export_to_csv(df, output_path))
-
-            elif format_type == 'json':
-                output_path = output_dir / f"{args.filename}.json"
-                exported_files.append(export_to_json(df, output_path))
-
-            elif format_type == 'excel':
-                output_path = output_dir / f"{args.filename}.xlsx"
-                exported_files.append(export_to_excel(df, output_path))
+        # Export to specified formats concurrently; the writers release the GIL
+        formats = list(dict.fromkeys(args.formats))
+        with ThreadPoolExecutor(max_workers=len(formats)) as executor:
+            futures = [executor.submit(export_format, format_type, df, output_dir,
+                                       args.filename, args.json_lines, args.fast_csv)
+                       for format_type in formats]
+            exported_files = [future.result() for future in futures]
 
         # Generate and save summary
         summary = generate_export_summary(df, exported_files)
@@ -157,7 +229,7 @@ def main():
         archive_path = None
         if args.create_archive:
             archive_path = output_dir / f"{args.filename}_archive.zip"
-            archive_result = create_data_archive(exported_files, archive_path)
+            archive_result = create_data_archive(exported_files, archive_path, args.compress_level)
             if archive_result:
                 exported_files.append(archive_result)
 
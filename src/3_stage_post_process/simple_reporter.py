@@ -14,6 +14,13 @@ import pandas as pd
 import json
 from pathlib import Path
 import logging
+import sys
+
+# Shared helpers live in src/, one level above the stage directories
+_src_dir = str(Path(__file__).resolve().parent.parent)
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+from pipeline_io import read_data
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -173,7 +180,8 @@ This report provides a basic overview of your dataset. The data has been success
 
     logger.info(f"Markdown report saved to: {output_path}")
 
-def main():
+def build_parser():
+    """Build the command-line parser for this component."""
     parser = argparse.ArgumentParser(description='Simple Report Generation Component')
     parser.add_argument('--input-path', type=str, required=True, help='Path to input data file')
     parser.add_argument('--output-path', type=str, required=True, help='Path to save report')
@@ -181,19 +189,26 @@ def main():
                        default='html', help='Report format')
     parser.add_argument('--title', type=str, default='Data Analysis Report', help='Report title')
 
-    args = parser.parse_args()
+    return parser
+
+def main(args=None):
+    if args is None:
+        args = build_parser().parse_args()
 
     try:
         # Load data
         logger.info(f"Loading data from {args.input_path}")
 
-        # Try to load as CSV first, then JSON
-        try:
-            df = pd.read_csv(args.input_path)
-        except:
-            with open(args.input_path, 'r') as f:
-                data = json.load(f)
-            df = pd.DataFrame(data)
+        # Load Parquet by extension, otherwise try CSV first, then JSON
+        if Path(args.input_path).suffix.lower() == '.parquet':
+            df = read_data(args.input_path)
+        else:
+            try:
+                df = read_data(args.input_path)
+            except:
+                with open(args.input_path, 'r') as f:
+                    data = json.load(f)
+                df = pd.DataFrame(data)
 
         logger.info(f"Loaded data with shape: {df.shape}")
 
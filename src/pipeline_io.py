@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Shared Pipeline I/O Helpers
+===========================
+
+Reading and writing helpers shared by the pipeline components, so the
+Parquet/CSV dispatch and the optional pyarrow fast paths behave the same
+in every stage.
+
+Components import this module from the src/ directory above their stage folder.
+"""
+
+import pandas as pd
+from pathlib import Path
+import logging
+
+logger = logging.getLogger(__name__)
+
+def fast_read_csv(path):
+    """Read a CSV with the multithreaded pyarrow parser, falling back to pandas."""
+    try:
+        from pyarrow import csv as pa_csv
+    except ImportError:
+        logger.warning("pyarrow not available, using pandas CSV reader")
+        return pd.read_csv(path)
+
+    table = pa_csv.read_csv(path)
+    return table.to_pandas(split_blocks=True, self_destruct=True, date_as_object=False)
+
+def fast_to_csv(df, output_path, batch_size=8192):
+    """Write a CSV with the multithreaded pyarrow writer, falling back to pandas.
+
+    batch_size is the number of rows pyarrow formats per batch.
+    """
+    try:
+        import pyarrow as pa
+        from pyarrow import csv as pa_csv
+    except ImportError:
+        logger.warning("pyarrow not available, using pandas CSV writer")
+        df.to_csv(output_path, index=False)
+        return
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pa_csv.write_csv(table, output_path, pa_csv.WriteOptions(batch_size=batch_size))
+
+def read_data(input_path, fast_csv=False):
+    """Load data, reading Parquet or CSV based on the file extension."""
+    if Path(input_path).suffix.lower() == '.parquet':
+        return pd.read_parquet(input_path, engine='pyarrow')
+    if fast_csv:
+        return fast_read_csv(input_path)
+    return pd.read_csv(input_path)
+
+def save_data(df, output_path, fast_csv=False):
+    """Save data, writing Parquet or CSV based on the file extension."""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if output_path.suffix.lower() == '.parquet':
+        df.to_parquet(output_path, engine='pyarrow', compression='zstd', index=False)
+    elif fast_csv:
+        fast_to_csv(df, output_path)
+    else:
+        df.to_csv(output_path, index=False)
+
+    return output_path
+
+def estimate_memory_mb(df):
+    """Estimate DataFrame memory in MB without walking object column contents."""
+    return round(df.memory_usage(deep=False).sum() / 1024**2, 2)